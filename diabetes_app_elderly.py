@@ -22,17 +22,18 @@ References:
 """
 
 import streamlit as st
-import pandas as pd
 import numpy as np
 import joblib
-import shap
-import matplotlib.pyplot as plt
-import time
+import bisect
+import csv
+import re
+import sys
+from types import MappingProxyType, SimpleNamespace
 
 # ============================================================================
 # TRANSLATIONS - English and Malay
 # ============================================================================
-TRANSLATIONS = {
+TRANSLATIONS = MappingProxyType({
     'en': {
         'welcome_title': 'Welcome to Your Health Assessment!',
         'welcome_msg': 'This simple tool helps you understand your likelihood of developing diabetes.',
@@ -133,6 +134,7 @@ TRANSLATIONS = {
         'what_influences': 'What influences your result?',
         'influences_msg': 'Below are the main health factors that affected your diabetes probability score. Understanding these can help you make better health decisions.',
         'top5_factors': 'Top 5 Factors Affecting Your Results:',
+        'no_factor_breakdown': 'A factor-by-factor breakdown is not available for this prediction model.',
         'increases_prob': 'Increases Probability',
         'decreases_prob': 'Decreases Probability',
         'impact': 'Impact: This factor',
@@ -291,6 +293,7 @@ TRANSLATIONS = {
         'what_influences': 'Apa yang mempengaruhi keputusan anda?',
         'influences_msg': 'Di bawah adalah faktor kesihatan utama yang mempengaruhi skor kebarangkalian diabetes anda. Memahami ini boleh membantu anda membuat keputusan kesihatan yang lebih baik.',
         'top5_factors': '5 Faktor Teratas yang Mempengaruhi Keputusan Anda:',
+        'no_factor_breakdown': 'Pecahan mengikut faktor tidak tersedia untuk model ramalan ini.',
         'increases_prob': 'Meningkatkan Kebarangkalian',
         'decreases_prob': 'Mengurangkan Kebarangkalian',
         'impact': 'Kesan: Faktor ini',
@@ -349,13 +352,14 @@ TRANSLATIONS = {
         'moderate': 'sederhana',
         'higher': 'lebih tinggi',
     }
-}
+})
 
 def t(key):
-    """Get translation for current language"""
-    return TRANSLATIONS[st.session_state.language].get(key, key)
+    """Get translation for current language (use T.<key> for static keys)"""
+    return _translate(key, key)
 
-# Additional translation dictionaries for form options
+# Additional translation dictionaries for form options, keyed by option code so
+# a widget's format_func can be the bound __getitem__ of one language's table
 AGE_GROUPS = {
     'en': {1: "18-24 years", 2: "25-29 years", 3: "30-34 years", 4: "35-39 years", 5: "40-44 years", 6: "45-49 years",
            7: "50-54 years", 8: "55-59 years", 9: "60-64 years", 10: "65-69 years", 11: "70-74 years", 12: "75-79 years", 13: "80 years or older"},
@@ -395,8 +399,6 @@ if 'current_step' not in st.session_state:
     st.session_state.current_step = 1
 if 'user_data' not in st.session_state:
     st.session_state.user_data = {}
-if 'show_help' not in st.session_state:
-    st.session_state.show_help = {}
 if 'language' not in st.session_state:
     st.session_state.language = 'en'  # 'en' for English, 'ms' for Malay
 if 'font_size' not in st.session_state:
@@ -408,357 +410,34 @@ if 'screen_reader_mode' not in st.session_state:
 if 'show_keyboard_shortcuts' not in st.session_state:
     st.session_state.show_keyboard_shortcuts = False
 
+# Bind the active language's lookup so t() skips the per-call language indirection,
+# and expose it as attributes (T.step1_title) for static labels
+_translate = TRANSLATIONS[st.session_state.language].get
+T = SimpleNamespace(**TRANSLATIONS[st.session_state.language])
+
 # ============================================================================
 # CUSTOM CSS FOR ELDERLY-FRIENDLY UI
 # ============================================================================
 
-# Dynamic font size CSS based on user preference
-font_size = st.session_state.get('font_size', 20)
-heading_multiplier = 2.4  # 48px at default 20px
-section_multiplier = 1.6  # 32px at default 20px
-label_multiplier = 1.1  # 22px at default 20px
+def minify_css(css):
+    """Strip comments and collapse whitespace around CSS punctuation."""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    return re.sub(r'\s*([:;{},])\s*', r'\1', css).strip()
 
-st.markdown(f"""
-<style>
-    /* Base font size - adjustable for elderly users (WCAG AAA) */
-    html, body, [class*="css"] {{
-        font-size: {font_size}px !important;
-        line-height: 1.6 !important;
-    }}
-    
-    /* Main container - centered with max width for readability */
-    .main .block-container {{
-        max-width: 900px;
-        padding: 2rem 1.5rem;
-    }}
-    
-    /* Main title styling - High contrast */
-    .main-title {{
-        font-size: {font_size * heading_multiplier}px !important;
-        font-weight: bold !important;
-        color: #000000 !important;
-        text-align: center;
-        padding: 25px 0;
-        margin-bottom: 30px;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-    }}
-    
-    /* Section headers - High contrast (7:1 ratio) */
-    .section-header {{
-        font-size: {font_size * section_multiplier}px !important;
-        font-weight: bold !important;
-        border-bottom: 4px solid #667eea;
-        padding-bottom: 15px;
-        margin: 40px 0 25px 0;
-    }}
-    
-    /* Step indicator - Clear progress tracking */
-    .step-indicator {{
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        border-radius: 60px;
-        padding: 20px 40px;
-        text-align: center;
-        font-size: 24px;
-        font-weight: bold;
-        color: white;
-        margin-bottom: 30px;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-    }}
-    
-    /* Large readable labels with high contrast */
-    .stSelectbox label, .stSlider label, .stRadio label, .stNumberInput label {{
-        font-size: {font_size * label_multiplier}px !important;
-        font-weight: 700 !important;
-        line-height: 1.5 !important;
-        margin-bottom: 10px !important;
-    }}
-    
-    /* Larger buttons - Minimum 44x44px touch target */
-    .stButton {{
-        width: 100% !important;
-    }}
-    
-    .stButton > button {{
-        font-size: {max(font_size - 4, 14)}px !important;
-        font-weight: 600 !important;
-        padding: 15px 20px !important;
-        border-radius: 12px !important;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
-        color: white !important;
-        border: 3px solid #5a67d8 !important;
-        width: 100% !important;
-        margin: 10px 0 !important;
-        min-height: 56px !important;
-        height: auto !important;
-        box-sizing: border-box !important;
-        overflow: visible !important;
-        overflow-wrap: break-word !important;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        transition: all 0.3s ease;
-        white-space: normal !important;
-        word-wrap: break-word !important;
-        line-height: 1.4 !important;
-        display: block !important;
-        text-align: center !important;
-    }}
-    
-    /* Button text content - target all possible inner elements */
-    .stButton > button > div,
-    .stButton > button > div > p,
-    .stButton > button > p,
-    .stButton > button > span,
-    .stButton > button div,
-    .stButton > button p,
-    .stButton > button span {{
-        white-space: normal !important;
-        word-wrap: break-word !important;
-        overflow-wrap: break-word !important;
-        word-break: break-word !important;
-        hyphens: auto !important;
-        text-align: center !important;
-        margin: 0 !important;
-        padding: 0 !important;
-        line-height: 1.4 !important;
-        max-width: 100% !important;
-        width: 100% !important;
-        display: block !important;
-    }}
-    
-    .stButton > button:hover {{
-        background: linear-gradient(135deg, #5a67d8 0%, #6b46a0 100%) !important;
-        transform: scale(1.02);
-        box-shadow: 0 6px 12px rgba(0,0,0,0.15);
-    }}
-    
-    .stButton > button:active {{
-        transform: scale(0.98);
-    }}
-    
-    /* Probability result boxes - Dark mode compatible */
-    .prob-low {{
-        background-color: color-mix(in srgb, #22C55E 15%, transparent);
-        border: 5px solid #22C55E;
-        border-radius: 25px;
-        padding: 40px;
-        text-align: center;
-        margin: 25px 0;
-        box-shadow: 0 6px 12px rgba(0,0,0,0.1);
-    }}
-    
-    .prob-medium {{
-        background-color: color-mix(in srgb, #EAB308 15%, transparent);
-        border: 5px solid #EAB308;
-        border-radius: 25px;
-        padding: 40px;
-        text-align: center;
-        margin: 25px 0;
-        box-shadow: 0 6px 12px rgba(0,0,0,0.1);
-    }}
-    
-    .prob-high {{
-        background-color: color-mix(in srgb, #EF4444 15%, transparent);
-        border: 5px solid #EF4444;
-        border-radius: 25px;
-        padding: 40px;
-        text-align: center;
-        margin: 25px 0;
-        box-shadow: 0 6px 12px rgba(0,0,0,0.1);
-    }}
-    
-    .prob-text {{
-        font-size: 42px !important;
-        font-weight: bold !important;
-    }}
-    
-    .probability-text {{
-        font-size: 28px !important;
-        margin-top: 20px;
-        font-weight: 600;
-    }}
-    
-    /* Info boxes - High contrast with clear borders - Dark mode compatible */
-    .info-box {{
-        background-color: color-mix(in srgb, var(--primary-color, #667eea) 15%, transparent);
-        border: 3px solid var(--primary-color, #667eea);
-        border-left: 8px solid var(--primary-color, #667eea);
-        padding: 25px;
-        margin: 20px 0;
-        border-radius: 15px;
-        font-size: 20px;
-        line-height: 1.8;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-    }}
-    
-    .help-box {{
-        background-color: color-mix(in srgb, #DD6B20 10%, transparent);
-        border: 3px solid #DD6B20;
-        border-left: 8px solid #DD6B20;
-        padding: 20px;
-        margin: 15px 0;
-        border-radius: 12px;
-        font-size: 18px;
-        line-height: 1.7;
-    }}
-    
-    /* Action plan cards - Dark mode compatible */
-    .action-card {{
-        background-color: color-mix(in srgb, #3B82F6 12%, transparent);
-        border: 3px solid #3B82F6;
-        border-radius: 18px;
-        padding: 25px;
-        margin: 15px 0;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-        line-height: 1.7;
-    }}
-    
-    .action-card .action-highlight {{
-        color: #60A5FA !important;
-    }}
-    
-    /* Explanation cards with better spacing - Dark mode compatible */
-    .explanation-card {{
-        background-color: color-mix(in srgb, currentColor 8%, transparent);
-        border: 3px solid color-mix(in srgb, currentColor 30%, transparent);
-        border-radius: 18px;
-        padding: 25px;
-        margin: 15px 0;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-        line-height: 1.7;
-    }}
-    
-    /* SHAP factor cards - Dark mode compatible */
-    .factor-card-positive {{
-        background-color: color-mix(in srgb, #FC8181 12%, transparent);
-        border: 3px solid #FC8181;
-        border-left: 6px solid #FC8181;
-        border-radius: 15px;
-        padding: 25px;
-        margin: 15px 0;
-    }}
-    
-    .factor-card-negative {{
-        background-color: color-mix(in srgb, #68D391 12%, transparent);
-        border: 3px solid #68D391;
-        border-left: 6px solid #68D391;
-        border-radius: 15px;
-        padding: 25px;
-        margin: 15px 0;
-    }}
-    
-    /* Radio buttons - Larger touch targets - Dark mode compatible */
-    .stRadio > div {{
-        gap: 20px !important;
-    }}
-    
-    .stRadio > div > label {{
-        padding: 15px 25px !important;
-        font-size: 20px !important;
-        border: 2px solid rgba(128, 128, 128, 0.3) !important;
-        border-radius: 12px !important;
-        min-width: 120px;
-        text-align: center;
-    }}
-    
-    .stRadio > div > label:hover {{
-        border-color: #667eea !important;
-    }}
-    
-    /* Language toggle button */
-    [data-testid="stButton"][key="lang_toggle"] button,
-    button[kind="secondary"] {{
-        white-space: nowrap !important;
-        min-width: 100px !important;
-        padding: 15px 20px !important;
-        font-size: 18px !important;
-    }}
-    
-    /* Progress bar */
-    .progress-bar {{
-        width: 100%;
-        height: 12px;
-        background-color: #E2E8F0;
-        border-radius: 10px;
-        overflow: hidden;
-        margin: 20px 0;
-    }}
-    
-    .progress-fill {{
-        height: 100%;
-        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-        transition: width 0.3s ease;
-    }}
-    
-    /* Success/Warning/Error messages - High contrast */
-    .stSuccess, .stWarning, .stError, .stInfo {{
-        font-size: 19px !important;
-        padding: 20px !important;
-        border-radius: 12px !important;
-        line-height: 1.7 !important;
-    }}
-    
-    /* Footer - Dark mode compatible */
-    .footer {{
-        text-align: center;
-        opacity: 0.7;
-        font-size: 16px;
-        padding: 40px 0;
-        border-top: 2px solid color-mix(in srgb, currentColor 20%, transparent);
-        margin-top: 60px;
-    }}
-    
-    /* Accessibility: Focus indicators */
-    *:focus {{
-        outline: 3px solid #4299E1 !important;
-        outline-offset: 2px !important;
-    }}
-    
-    /* Reduce motion for users who prefer it */
-    @media (prefers-reduced-motion: reduce) {{
-        * {{
-            animation-duration: 0.01ms !important;
-            animation-iteration-count: 1 !important;
-            transition-duration: 0.01ms !important;
-        }}
-    }}
-    
-    /* Keyboard navigation indicators */
-    .keyboard-hint {{
-        background-color: color-mix(in srgb, #4299E1 15%, transparent);
-        border: 2px solid #4299E1;
-        border-radius: 8px;
-        padding: 10px 15px;
-        font-size: {font_size * 0.85}px;
-        margin: 10px 0;
-        display: inline-block;
-    }}
-    
-    /* Screen reader only text */
-    .sr-only {{
-        position: absolute;
-        width: 1px;
-        height: 1px;
-        padding: 0;
-        margin: -1px;
-        overflow: hidden;
-        clip: rect(0,0,0,0);
-        white-space: nowrap;
-        border-width: 0;
-    }}
-    
-    /* Confirmation dialog */
-    .confirmation-dialog {{
-        background-color: color-mix(in srgb, #FFA500 20%, transparent);
-        border: 4px solid #FFA500;
-        border-radius: 20px;
-        padding: 30px;
-        margin: 20px 0;
-        box-shadow: 0 8px 16px rgba(0,0,0,0.2);
-    }}
-</style>
-""", unsafe_allow_html=True)
+@st.cache_data(show_spinner=False)
+def load_stylesheet():
+    """Read and minify the static stylesheet once per process."""
+    with open('static/styles.css', encoding='utf-8') as f:
+        return minify_css(f.read())
+
+def build_css(font_size):
+    """Wrap the stylesheet with the user's base font size (16-28px)."""
+    return f"<style>:root{{--base-font-size:{font_size}px}}{load_stylesheet()}</style>"
+
+# Streamlit drops elements that are not re-emitted, so the style block is
+# sent on every rerun; only the file read and minification are cached.
+st.markdown(build_css(st.session_state.get('font_size', 20)), unsafe_allow_html=True)
 
 # ============================================================================
 # LOAD MODEL AND RESOURCES
@@ -768,38 +447,107 @@ def load_model():
     """Load the trained model and scaler."""
     try:
         model = joblib.load('best_diabetes_model.pkl')
-        scaler = joblib.load('feature_scaler.pkl')
-        features = pd.read_csv('model_features.csv')['features'].tolist()
+        # StandardScaler mean_/scale_ exported by the training notebook, memory-mapped
+        # so no pickle or sklearn code runs to rebuild the scaler
+        scaler = (np.load('scaler_mean.npy', mmap_mode='r'), np.load('scaler_scale.npy', mmap_mode='r'))
+        # Immutable, hashable and shared by every session for the process lifetime.
+        # Newer pickles carry the feature order; older ones need model_features.csv
+        features = getattr(model, 'feature_names_', None)
+        if features is None:
+            with open('model_features.csv', newline='', encoding='utf-8') as f:
+                features = [row['features'] for row in csv.DictReader(f)]
+        features = tuple(sys.intern(str(feature)) for feature in features)
         return model, scaler, features
     except Exception as e:
         st.error(f"Error loading model: {e}")
         return None, None, None
 
+def standardize(input_row, scaler):
+    """Apply the StandardScaler transform, (x - mean) / scale, in NumPy."""
+    mean, scale = scaler
+    return (input_row - mean) / scale
+
+@st.cache_resource
+def get_feature_index(features):
+    """Map each feature name to its column in the model's input row."""
+    return MappingProxyType({feature: j for j, feature in enumerate(features)})
+
+def _fill_and_scale(indices, values, mean, scale):
+    """Scatter (column, value) pairs into a row and standardize it; unset columns are 0."""
+    row = np.zeros((1, mean.shape[0]), dtype=np.float32)
+    row[0, indices] = values
+    return standardize(row, (mean, scale)).astype(np.float32)
+
+@st.cache_resource
+def get_explainer(_model):
+    """Build the SHAP explainer once per process (the model is not hashed)."""
+    # Imported here so steps 1-4 never pay the shap/numba import cost
+    import shap
+    return shap.TreeExplainer(_model)
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def predict_probability(input_row):
+    """Predict the diabetes probability for one scaled input row, memoized per input tuple."""
+    model, _, _ = load_model()
+    return float(model.predict_proba(np.asarray(input_row, dtype=np.float32).reshape(1, -1))[0][1])
+
+# Estimators the training notebook can pick that TreeExplainer handles natively
+TREE_MODEL_TYPES = frozenset({
+    'RandomForestClassifier', 'ExtraTreesClassifier', 'DecisionTreeClassifier',
+    'GradientBoostingClassifier', 'XGBClassifier', 'LGBMClassifier',
+})
+
+def is_tree_model(model):
+    """Whether the model can use TreeExplainer."""
+    return type(model).__name__ in TREE_MODEL_TYPES
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def compute_shap_values(input_row):
+    """Compute SHAP values for one scaled input row, memoized per input tuple.
+    
+    Returns None when the model has no per-user attribution (neither tree nor linear).
+    """
+    model, _, _ = load_model()
+    input_row = np.asarray(input_row, dtype=np.float32).reshape(1, -1)
+    if not is_tree_model(model):
+        # Skip shap's sampling explainers: on standardized inputs coef * x is the
+        # linear SHAP value
+        if hasattr(model, 'coef_'):
+            return np.asarray(model.coef_).reshape(1, -1) * input_row
+        return None
+    # Explanation values are (rows, features) or, with a class axis, (rows, features, classes)
+    shap_values = get_explainer(model)(input_row).values
+    return shap_values[..., 1] if shap_values.ndim == 3 else shap_values
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
+# Step-indicator pill above the native st.progress bar
+STEP_INDICATOR_TEMPLATE = (
+    '<div class="step-indicator" role="status" aria-live="polite">'
+    '<span class="sr-only">Progress: Step {step} of {total}</span>'
+    '📍 {step_label} {step} {of_label} {total}</div>'
+)
+
+def build_progress_html(current_step, total_steps, language):
+    """Build the step indicator for one step and language."""
+    tr = TRANSLATIONS[language]
+    return STEP_INDICATOR_TEMPLATE.format(
+        step=current_step, total=total_steps, step_label=tr['step'], of_label=tr['of']
+    )
+
 def show_progress_bar(current_step, total_steps=5):
     """Display a progress bar showing current step."""
-    progress = (current_step / total_steps) * 100
-    st.markdown(f"""
-    <div class="step-indicator" role="status" aria-live="polite">
-        <span class="sr-only">Progress: Step {current_step} of {total_steps}</span>
-        📍 {t('step')} {current_step} {t('of')} {total_steps}
-    </div>
-    <div class="progress-bar" role="progressbar" aria-valuenow="{progress}" aria-valuemin="0" aria-valuemax="100" aria-label="Assessment progress">
-        <div class="progress-fill" style="width: {progress}%;"></div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(build_progress_html(current_step, total_steps, st.session_state.language), unsafe_allow_html=True)
+    # Native widget: the front end only updates the fill value between reruns
+    st.progress(current_step / total_steps)
 
-def show_help_button(help_text, key):
-    """Display a help button with tooltip."""
-    if st.button(f"❓ {t('need_help')}", key=f"help_{key}", help="Press H for help"):
-        st.session_state.show_help[key] = not st.session_state.show_help.get(key, False)
-    
-    if st.session_state.show_help.get(key, False):
+def show_help(help_text):
+    """Display collapsible help; the expander opens client-side without a rerun."""
+    with st.expander(f"❓ {T.need_help}", expanded=False):
         st.markdown(f"""
         <div class="help-box" role="complementary" aria-label="Help information">
-            <strong>ℹ️ {t('help_info')}</strong><br><br>
+            <strong>ℹ️ {T.help_info}</strong><br><br>
             {help_text}
         </div>
         """, unsafe_allow_html=True)
@@ -840,8 +588,8 @@ def inject_keyboard_handler():
             document.removeEventListener('keydown', window.handleKeyboard);
         }
         
-        function findAndClickButton(textPatterns) {
-            const buttons = parent.document.querySelectorAll('button');
+        function findAndClickButton(textPatterns, selector = 'button') {
+            const buttons = parent.document.querySelectorAll(selector);
             for (let btn of buttons) {
                 const text = btn.innerText.toUpperCase();
                 for (let pattern of textPatterns) {
@@ -871,11 +619,11 @@ def inject_keyboard_handler():
                 e.stopPropagation();
                 findAndClickButton(['BACK', 'KEMBALI']);
             }
-            // Alt + H: Toggle Help
+            // Alt + H: Toggle Help (the help expander's <summary>)
             else if (e.altKey && e.key.toLowerCase() === 'h') {
                 e.preventDefault();
                 e.stopPropagation();
-                findAndClickButton(['Need Help', 'Perlukan Bantuan']);
+                findAndClickButton(['Need Help', 'Perlukan Bantuan'], 'summary');
             }
             // Alt + R: Restart
             else if (e.altKey && e.key.toLowerCase() === 'r') {
@@ -894,6 +642,50 @@ def inject_keyboard_handler():
     
     components.html(keyboard_js, height=0)
 
+# Button callbacks run before the next script run, so state changes need no st.rerun()
+def set_state(**values):
+    """Callback: assign session-state values."""
+    st.session_state.update(values)
+
+def go_to_step(step, fields=None):
+    """Callback: copy form widgets (user_data name -> widget key) into user_data, then move to step."""
+    if fields:
+        st.session_state.user_data.update({name: st.session_state[key] for name, key in fields.items()})
+    st.session_state.current_step = step
+
+def body_measurements(weight_kg, height_cm):
+    """Derive the model's weight and BMI inputs from metric measurements."""
+    # Calculate BMI from weight (kg) and height (cm)
+    height_m = height_cm / 100.0  # Convert cm to meters
+    bmi = weight_kg / (height_m ** 2)
+    
+    # Calculate BMI category
+    if bmi < 18.5:
+        bmi_category = 1  # Underweight
+    elif bmi < 25:
+        bmi_category = 2  # Normal
+    elif bmi < 30:
+        bmi_category = 3  # Overweight
+    else:
+        bmi_category = 4  # Obese
+    
+    return {
+        'weight_kg': weight_kg,
+        'height_cm': height_cm,
+        'WGHT (lbs)': weight_kg * 2.20462,  # The model expects pounds (1 kg = 2.20462 lbs)
+        'BMI': bmi,
+        'BMI_CATEGORY': bmi_category
+    }
+
+def leave_step2(step):
+    """Callback: store step 2's current widget values (the step body won't run again) and move on."""
+    st.session_state.user_data.update(body_measurements(st.session_state.weight_kg, st.session_state.height_cm))
+    go_to_step(step, {'GEN_HLTH': 'gen_health', 'CHKP_STATUS': 'checkup'})
+
+def toggle_language():
+    """Callback: switch between English and Malay."""
+    st.session_state.language = 'ms' if st.session_state.language == 'en' else 'en'
+
 def confirm_action(action_key, title, message, on_confirm):
     """Show confirmation dialog for critical actions."""
     st.markdown(f"""
@@ -904,77 +696,292 @@ def confirm_action(action_key, title, message, on_confirm):
     """, unsafe_allow_html=True)
     
     col1, col2 = st.columns(2)
-    confirmed = False
     with col1:
-        if st.button(f"✅ {t('yes')}", key=f"{action_key}_yes", use_container_width=True):
-            confirmed = True
-            on_confirm()
+        confirmed = st.button(f"✅ {T.yes}", key=f"{action_key}_yes", use_container_width=True, on_click=on_confirm)
     with col2:
-        if st.button(f"❌ {t('no')}", key=f"{action_key}_no", use_container_width=True):
-            st.session_state.show_confirmation = False
-            st.rerun()
+        st.button(f"❌ {T.no}", key=f"{action_key}_no", use_container_width=True,
+                  on_click=set_state, kwargs={'show_confirmation': False})
     return confirmed
 
-def get_probability_level(probability):
-    """Categorize likelihood level based on probability."""
-    if probability < 0.3:
-        return "LOW", "prob-low", "🟢"
-    elif probability < 0.6:
-        return "MODERATE", "prob-medium", "🟡"
-    else:
-        return "HIGH", "prob-high", "🔴"
+# Probability band boundaries: < 0.3 is LOW, < 0.6 is MODERATE, otherwise HIGH
+PROBABILITY_THRESHOLDS = (0.3, 0.6)
 
-def generate_explanation(shap_values, feature_names, feature_values):
-    """Generate human-readable explanations from SHAP values."""
-    explanations = []
-    
-    # Get top contributing factors
-    importance = list(zip(feature_names, shap_values, feature_values))
-    importance.sort(key=lambda x: abs(x[1]), reverse=True)
+# Display per band, indexed by bisect(PROBABILITY_THRESHOLDS, p): (level key, CSS class, emoji)
+PROBABILITY_LEVELS = (
+    ("LOW", "prob-box prob-low", "🟢"),
+    ("MODERATE", "prob-box prob-medium", "🟡"),
+    ("HIGH", "prob-box prob-high", "🔴"),
+)
+
+# Interpretation message per band, indexed by bisect(PROBABILITY_THRESHOLDS, p):
+# (alert, title icon, title key, message key, list heading key, (bullet icon, key) items,
+#  closing label per language, closing key)
+INTERPRETATION_BANDS = (
+    ('success', '✅', 'low_title', 'low_msg', 'low_keep',
+     (('✓', 'low_1'), ('✓', 'low_2'), ('✓', 'low_3'), ('✓', 'low_4')),
+     {'en': 'Remember', 'ms': 'Ingat'}, 'low_remember'),
+    ('warning', '⚠️', 'moderate_title', 'moderate_msg', 'moderate_what',
+     (('📞', 'moderate_1'), ('🥗', 'moderate_2'), ('🏃', 'moderate_3'), ('📊', 'moderate_4'), ('⚖️', 'moderate_5')),
+     {'en': 'Good news', 'ms': 'Berita baik'}, 'moderate_good'),
+    ('error', '🚨', 'high_title', 'high_msg', 'high_steps',
+     (('🏥', 'high_1'), ('🩸', 'high_2'), ('💬', 'high_3'), ('🥗', 'high_4'), ('🏃', 'high_5'), ('⚖️', 'high_6')),
+     {'en': 'Remember', 'ms': 'Ingat'}, 'high_remember'),
+)
+
+def get_probability_band(probability):
+    """Index of the band a probability falls in (0 LOW, 1 MODERATE, 2 HIGH)."""
+    return bisect.bisect(PROBABILITY_THRESHOLDS, probability)
+
+# |SHAP| above this counts as a significant contribution
+SIGNIFICANT_IMPACT = 0.1
+
+def _top_k_abs(values, k):
+    """Return each row's k largest-magnitude entries, largest first.
     
-    # Bilingual explanation templates: (English name, English desc, Malay name, Malay desc)
-    explanation_templates = {
-        'GEN_HLTH': ("General Health", "Your overall health rating", "Kesihatan Am", "Penilaian kesihatan keseluruhan anda"),
-        'BMI': ("Body Mass Index", "Your body weight relative to height", "Indeks Jisim Badan", "Berat badan anda berbanding ketinggian"),
-        'AGE_GROUP': ("Age Group", "Your age category", "Kumpulan Umur", "Kategori umur anda"),
-        'AGE': ("Age", "Your age", "Umur", "Umur anda"),
-        'WGHT (lbs)': ("Weight", "Your body weight in pounds", "Berat Badan", "Berat badan anda dalam paun"),
-        'CHKP_STATUS': ("Checkup Status", "How recently you had a medical checkup", "Status Pemeriksaan", "Bila pemeriksaan perubatan terakhir anda"),
-        'ALHL_STATUS': ("Alcohol Status", "Your alcohol consumption habits", "Status Alkohol", "Tabiat pengambilan alkohol anda"),
-        'CHOL_MEDS': ("Cholesterol Medication", "Whether you take cholesterol medication", "Ubat Kolesterol", "Sama ada anda mengambil ubat kolesterol"),
-        'DCTR_STATUS': ("Doctor Visits", "Your frequency of doctor visits", "Lawatan Doktor", "Kekerapan lawatan doktor anda"),
-        'EDUCATION_LEVEL': ("Education Level", "Your education level", "Tahap Pendidikan", "Tahap pendidikan anda"),
-        'EMPLOYMENT_STATUS': ("Employment Status", "Your current employment status", "Status Pekerjaan", "Status pekerjaan semasa anda"),
-        'SEX': ("Sex", "Your biological sex", "Jantina", "Jantina biologi anda"),
-        'EXER_STATUS': ("Exercise Status", "Your physical activity level", "Status Senaman", "Tahap aktiviti fizikal anda"),
-        'BMI_CATEGORY': ("BMI Category", "Your BMI classification", "Kategori BMI", "Klasifikasi BMI anda"),
-        'BP_MEDS': ("Blood Pressure Medication", "Whether you take blood pressure medication", "Ubat Tekanan Darah", "Sama ada anda mengambil ubat tekanan darah"),
-    }
+    Yields (indices, values, is_positive, is_significant) so the explanation
+    text only has to format the flags.
+    """
+    magnitudes = np.abs(values)
+    k = min(k, magnitudes.shape[1])
+    # Partial selection of the top k per row, then order just those k
+    idx = np.argpartition(-magnitudes, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(magnitudes, idx, axis=1), axis=1)
+    idx = np.take_along_axis(idx, order, axis=1)
+    top = np.take_along_axis(values, idx, axis=1)
+    return idx, top, top > 0, np.abs(top) > SIGNIFICANT_IMPACT
+
+# Bilingual explanation templates: (English name, English desc, Malay name, Malay desc)
+EXPLANATION_TEMPLATES = MappingProxyType({
+    'GEN_HLTH': ("General Health", "Your overall health rating", "Kesihatan Am", "Penilaian kesihatan keseluruhan anda"),
+    'BMI': ("Body Mass Index", "Your body weight relative to height", "Indeks Jisim Badan", "Berat badan anda berbanding ketinggian"),
+    'AGE_GROUP': ("Age Group", "Your age category", "Kumpulan Umur", "Kategori umur anda"),
+    'AGE': ("Age", "Your age", "Umur", "Umur anda"),
+    'WGHT (lbs)': ("Weight", "Your body weight in pounds", "Berat Badan", "Berat badan anda dalam paun"),
+    'CHKP_STATUS': ("Checkup Status", "How recently you had a medical checkup", "Status Pemeriksaan", "Bila pemeriksaan perubatan terakhir anda"),
+    'ALHL_STATUS': ("Alcohol Status", "Your alcohol consumption habits", "Status Alkohol", "Tabiat pengambilan alkohol anda"),
+    'CHOL_MEDS': ("Cholesterol Medication", "Whether you take cholesterol medication", "Ubat Kolesterol", "Sama ada anda mengambil ubat kolesterol"),
+    'DCTR_STATUS': ("Doctor Visits", "Your frequency of doctor visits", "Lawatan Doktor", "Kekerapan lawatan doktor anda"),
+    'EDUCATION_LEVEL': ("Education Level", "Your education level", "Tahap Pendidikan", "Tahap pendidikan anda"),
+    'EMPLOYMENT_STATUS': ("Employment Status", "Your current employment status", "Status Pekerjaan", "Status pekerjaan semasa anda"),
+    'SEX': ("Sex", "Your biological sex", "Jantina", "Jantina biologi anda"),
+    'EXER_STATUS': ("Exercise Status", "Your physical activity level", "Status Senaman", "Tahap aktiviti fizikal anda"),
+    'BMI_CATEGORY': ("BMI Category", "Your BMI classification", "Kategori BMI", "Klasifikasi BMI anda"),
+    'BP_MEDS': ("Blood Pressure Medication", "Whether you take blood pressure medication", "Ubat Tekanan Darah", "Sama ada anda mengambil ubat tekanan darah"),
+})
+
+@st.cache_resource
+def get_feature_labels(feature_names):
+    """Build per-feature label columns aligned to the model's feature order.
     
-    for feature, shap_val, feat_val in importance[:5]:
-        if feature in explanation_templates:
-            name_en, desc_en, name_ms, desc_ms = explanation_templates[feature]
+    Returns four object arrays (English name, English description, Malay name,
+    Malay description) so the top factors can be gathered by index.
+    """
+    rows = []
+    for feature in feature_names:
+        if feature in EXPLANATION_TEMPLATES:
+            rows.append(EXPLANATION_TEMPLATES[feature])
         else:
             name_en = feature.replace('_', ' ').title()
-            desc_en = f"Your {name_en.lower()}"
-            name_ms = name_en
-            desc_ms = desc_en
+            rows.append((name_en, f"Your {name_en.lower()}", name_en, f"Your {name_en.lower()}"))
+    return tuple(np.array(column, dtype=object) for column in zip(*rows))
+
+def generate_explanation_batch(shap_matrix, feature_names):
+    """Generate explanations for a batch of rows from an (N, F) SHAP matrix."""
+    # Get top contributing factors for every row at once
+    shap_matrix = np.atleast_2d(np.asarray(shap_matrix, dtype=np.float64))
+    top_idx, top_shap, positive, significant = _top_k_abs(shap_matrix, 5)
+    names_en, descs_en, names_ms, descs_ms = (column[top_idx] for column in get_feature_labels(tuple(feature_names)))
+    
+    batch = []
+    for row in zip(names_en, descs_en, names_ms, descs_ms, top_shap, positive.tolist(), significant.tolist()):
+        explanations = []
+        for name_en, desc_en, name_ms, desc_ms, shap_val, is_positive, is_significant in zip(*row):
+            explanations.append({
+                'feature_en': name_en,
+                'feature_ms': name_ms,
+                'description_en': desc_en,
+                'description_ms': desc_ms,
+                'direction': "increases" if is_positive else "decreases",
+                'impact': "significantly" if is_significant else "slightly",
+                'shap_value': shap_val,
+                'is_positive': is_positive
+            })
+        batch.append(explanations)
+    
+    return batch
+
+def generate_explanation(shap_values, feature_names):
+    """Generate human-readable explanations from SHAP values."""
+    return generate_explanation_batch(np.asarray(shap_values)[None, :], feature_names)[0]
+
+# Personalized recommendations in build_recommendations flag order: (icon, translation key prefix)
+RECOMMENDATION_RULES = (
+    ('⚖️', 'rec_weight'),
+    ('🏃', 'rec_exercise'),
+    ('❤️', 'rec_health'),
+    ('💊', 'rec_meds'),
+    ('🍺', 'rec_alcohol'),
+)
+
+def build_recommendations(language, bmi_ge25, no_exer, poor_health, on_meds, heavy_alcohol):
+    """Build the recommendation cards for one language and set of risk flags."""
+    tr = TRANSLATIONS[language]
+    flags = (bmi_ge25, no_exer, poor_health, on_meds, heavy_alcohol)
+    recommendations = [
+        {
+            'icon': icon,
+            'title': tr[f'{prefix}_title'],
+            'text': tr[f'{prefix}_text'],
+            'action': tr[f'{prefix}_action']
+        }
+        for flag, (icon, prefix) in zip(flags, RECOMMENDATION_RULES) if flag
+    ]
+    
+    if not recommendations:
+        recommendations.append({
+            'icon': '✅',
+            'title': tr['rec_good_title'],
+            'text': tr['rec_good_text'],
+            'action': tr['rec_good_action']
+        })
+    return recommendations
+
+# ============================================================================
+# STATIC HTML BLOCKS
+# ============================================================================
+# Invariant markup is built once; language/font-size dependent blocks are
+# formatted per run (a single f-string is cheaper than a cache lookup)
+KEYBOARD_HINT_HTML = """
+    <div class="keyboard-hint" role="note">
+        💡 <strong>Tip:</strong> Use <kbd>Tab</kbd> to navigate, <kbd>Alt+N</kbd> for Next, <kbd>Alt+B</kbd> for Back
+    </div>
+    """
+
+FOOTER_HTML = """
+    <div class="footer">
+        <strong style="font-size: 18px;">Diabetes Probability Assessment Tool for Older Adults</strong><br>
+        Developed for Research Project CSP760 (RO3)<br>
+        Using CDC BRFSS 2023-2024 Data with Explainable AI (SHAP/LIME)<br>
+        <br>
+        <em>For Educational and Research Purposes Only</em><br>
+        © 2026 - Not for Clinical Use
+    </div>
+    """
+
+# Step 5 cards, filled per item with format_map
+FACTOR_CARD_TEMPLATE = (
+    '<div class="{card_class}">'
+    '<strong style="font-size: 26px;">{i}. {feature_name}</strong><br><br>'
+    '<span style="font-size: 20px; line-height: 1.7;">'
+    '{feature_desc} <span style="color: {color}; font-weight: bold; font-size: 22px;">{icon}</span><br><br>'
+    '<em>{impact_text}</em>'
+    '</span></div>'
+)
+
+# Factor card styling by is_positive: (arrow, label key, text color, card class)
+FACTOR_DIRECTION_STYLES = {
+    True: ("⬆️", 'increases_prob', "#C53030", "factor-card-positive"),
+    False: ("⬇️", 'decreases_prob', "#276749", "factor-card-negative"),
+}
+
+ACTION_CARD_TEMPLATE = (
+    '<div class="action-card">'
+    '<strong style="font-size: 24px;">{icon} {title}</strong><br><br>'
+    '<span style="font-size: 19px; line-height: 1.7;">'
+    '{text}<br><br>'
+    '<span class="action-highlight"><strong>👉 {action_step}</strong></span> {action}'
+    '</span></div>'
+)
+
+def build_welcome_html(language, font_size):
+    """Build the welcome info box for one language and font size."""
+    tr = TRANSLATIONS[language]
+    return f"""
+    <div class="info-box" role="region" aria-label="Welcome message">
+        <strong style="font-size: {font_size * 1.2}px;">{tr['welcome_title']}</strong><br><br>
+        <span style="font-size: {font_size}px;">
+        {tr['welcome_msg']}<br><br>
+        ✅ {tr['easy_steps']}<br>
+        ✅ {tr['clear_results']}<br>
+        ✅ {tr['understand_factors']}<br>
+        ✅ {tr['get_recommendations']}
+        </span>
+    </div>
+    """
+
+def build_disclaimer_html(language, font_size):
+    """Build the medical disclaimer box for one language and font size."""
+    tr = TRANSLATIONS[language]
+    return f"""
+    <div style="background-color: color-mix(in srgb, #ff5555 10%, transparent); border: 4px solid #C53030; border-radius: 15px; padding: 30px; margin-top: 40px;" role="alert" aria-label="Medical disclaimer">
+        <p style="color: #C53030; font-size: {font_size * 1.2}px; font-weight: bold; margin: 0 0 20px 0;">⚠️ {tr['medical_disclaimer_title']}</p>
+        <p style="font-size: {font_size * 0.95}px; line-height: 1.8; margin: 0 0 15px 0;">
+        {tr['disclaimer_msg']}
+        </p>
+        <ul style="font-size: {font_size * 0.95}px; line-height: 1.8; margin: 0 0 15px 20px;">
+            <li>{tr['disclaimer_1']}</li>
+            <li>{tr['disclaimer_2']}</li>
+            <li>{tr['disclaimer_3']}</li>
+            <li>{tr['disclaimer_4']}</li>
+        </ul>
+    </div>
+    """
+
+# ============================================================================
+# STEP FRAGMENTS
+# ============================================================================
+@st.fragment
+def step2_measurements():
+    """Step 2 inputs and live BMI; edits rerun only this fragment."""
+    lang = st.session_state.language
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        weight_kg = st.number_input(
+            f"⚖️ {T.weight_label}",
+            min_value=20.0,
+            max_value=300.0,
+            value=st.session_state.user_data.get('weight_kg', 75.0),
+            step=0.5,
+            key="weight_kg"
+        )
         
-        direction = "increases" if shap_val > 0 else "decreases"
-        impact = "significantly" if abs(shap_val) > 0.1 else "slightly"
+        height_cm = st.number_input(
+            f"📏 {T.height_label}",
+            min_value=100.0,
+            max_value=250.0,
+            value=st.session_state.user_data.get('height_cm', 170.0),
+            step=0.5,
+            key="height_cm"
+        )
         
-        explanations.append({
-            'feature_en': name_en,
-            'feature_ms': name_ms,
-            'description_en': desc_en,
-            'description_ms': desc_ms,
-            'direction': direction,
-            'impact': impact,
-            'shap_value': shap_val,
-            'is_positive': shap_val > 0
-        })
+        measurements = body_measurements(weight_kg, height_cm)
+        
+        # Display calculated BMI
+        st.markdown(f"""
+        <div class="info-box" style="padding: 15px; margin: 10px 0;">
+            <strong>📊 {T.bmi_calculated}:</strong> <span style="font-size: 24px; font-weight: bold;">{measurements['BMI']:.1f}</span>
+        </div>
+        """, unsafe_allow_html=True)
     
-    return explanations
+    with col2:
+        gen_health = st.selectbox(
+            f"❤️ {T.gen_health_label}",
+            options=[1, 2, 3, 4, 5],
+            format_func=HEALTH_RATING[lang].__getitem__,
+            index=st.session_state.user_data.get('GEN_HLTH', 3) - 1,
+            key="gen_health"
+        )
+        
+        checkup = st.selectbox(
+            f"🩺 {T.checkup_label}",
+            options=[1, 2, 3, 4, 5],
+            format_func=CHECKUP_STATUS[lang].__getitem__,
+            index=0,
+            key="checkup"
+        )
+    
+    st.session_state.user_data.update(measurements, GEN_HLTH=gen_health, CHKP_STATUS=checkup)
 
 # ============================================================================
 # MAIN APPLICATION - STEP-BY-STEP INTERFACE
@@ -985,7 +992,7 @@ def main():
     
     if model is None:
         st.error("⚠️ Could not load the prediction model. Please ensure the model files exist.")
-        st.info("Required files: best_diabetes_model.pkl, feature_scaler.pkl, model_features.csv")
+        st.info("Required files: best_diabetes_model.pkl, scaler_mean.npy, scaler_scale.npy, model_features.csv")
         return
     
     # ========================================================================
@@ -996,30 +1003,26 @@ def main():
     col_font, col_lang, col_shortcuts = st.columns([2, 1.5, 1.5])
     
     with col_font:
-        font_size_new = st.slider(
+        st.slider(
             "🔤 Text Size / Saiz Teks",
             min_value=16,
             max_value=28,
             value=st.session_state.font_size,
             step=2,
             key="font_size_slider",
-            help="Adjust text size for better readability / Laraskan saiz teks untuk kebolehbacaan yang lebih baik"
+            help="Adjust text size for better readability / Laraskan saiz teks untuk kebolehbacaan yang lebih baik",
+            on_change=lambda: set_state(font_size=st.session_state.font_size_slider)
         )
-        if font_size_new != st.session_state.font_size:
-            st.session_state.font_size = font_size_new
-            st.rerun()
     
     with col_lang:
         lang_icon = "🇲🇾" if st.session_state.language == 'en' else "🇬🇧"
         lang_text = "BM" if st.session_state.language == 'en' else "EN"
-        if st.button(f"{lang_icon} {lang_text}", key="lang_toggle", use_container_width=True, help="Switch language / Tukar bahasa"):
-            st.session_state.language = 'ms' if st.session_state.language == 'en' else 'en'
-            st.rerun()
+        st.button(f"{lang_icon} {lang_text}", key="lang_toggle", use_container_width=True, help="Switch language / Tukar bahasa",
+                  on_click=toggle_language)
     
     with col_shortcuts:
-        if st.button("⌨️ Keys", key="show_shortcuts", use_container_width=True, help="Show keyboard shortcuts / Tunjuk pintasan papan kekunci"):
-            st.session_state.show_keyboard_shortcuts = not st.session_state.show_keyboard_shortcuts
-            st.rerun()
+        st.button("⌨️ Keys", key="show_shortcuts", use_container_width=True, help="Show keyboard shortcuts / Tunjuk pintasan papan kekunci",
+                  on_click=lambda: set_state(show_keyboard_shortcuts=not st.session_state.show_keyboard_shortcuts))
     
     # Keyboard shortcuts guide
     show_keyboard_shortcuts()
@@ -1042,25 +1045,10 @@ def main():
     if st.session_state.current_step <= 5:
         st.markdown(f'<div class="sr-only" role="status" aria-live="polite">Current section: {step_names[st.session_state.current_step-1]}</div>', unsafe_allow_html=True)
     
-    st.markdown(f"""
-    <div class="info-box" role="region" aria-label="Welcome message">
-        <strong style="font-size: {st.session_state.font_size * 1.2}px;">{t('welcome_title')}</strong><br><br>
-        <span style="font-size: {st.session_state.font_size}px;">
-        {t('welcome_msg')}<br><br>
-        ✅ {t('easy_steps')}<br>
-        ✅ {t('clear_results')}<br>
-        ✅ {t('understand_factors')}<br>
-        ✅ {t('get_recommendations')}
-        </span>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(build_welcome_html(st.session_state.language, st.session_state.font_size), unsafe_allow_html=True)
     
     # Keyboard navigation hint
-    st.markdown(f"""
-    <div class="keyboard-hint" role="note">
-        💡 <strong>Tip:</strong> Use <kbd>Tab</kbd> to navigate, <kbd>Alt+N</kbd> for Next, <kbd>Alt+B</kbd> for Back
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(KEYBOARD_HINT_HTML, unsafe_allow_html=True)
     
     st.markdown("---")
     
@@ -1073,244 +1061,164 @@ def main():
     
     # STEP 1: Basic Information
     if st.session_state.current_step == 1:
-        st.markdown(f'<h2 class="section-header" role="heading" aria-level="2">{t("step")} 1️⃣: {t("step1_title")}</h2>', unsafe_allow_html=True)
+        lang = st.session_state.language
+        st.markdown(f'<h2 class="section-header" role="heading" aria-level="2">{T.step} 1️⃣: {T.step1_title}</h2>', unsafe_allow_html=True)
         
-        show_help_button(t('step1_help'), "step1")
+        show_help(T.step1_help)
         
         # Screen reader context
         st.markdown('<span class="sr-only">Step 1 of 5: Please provide your basic demographic information. All fields are required.</span>', unsafe_allow_html=True)
         
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            age_group = st.selectbox(
-                f"🎂 {t('age_label')}",
-                options=list(range(1, 14)),
-                format_func=lambda x: AGE_GROUPS[st.session_state.language][x],
-                index=8,
-                key="age_group"
-            )
+        # Widgets are batched in a form so changing them doesn't rerun the script
+        with st.form("step1_form", border=False):
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                st.selectbox(
+                    f"🎂 {T.age_label}",
+                    options=list(range(1, 14)),
+                    format_func=AGE_GROUPS[lang].__getitem__,
+                    index=8,
+                    key="age_group"
+                )
             
-            sex = st.radio(
-                f"⚧ {t('sex_label')}",
-                options=[0, 1],
-                format_func=lambda x: t('female') if x == 0 else t('male'),
-                horizontal=True,
-                key="sex"
-            )
+                st.radio(
+                    f"⚧ {T.sex_label}",
+                    options=[0, 1],
+                    format_func=lambda x: T.female if x == 0 else T.male,
+                    horizontal=True,
+                    key="sex"
+                )
         
-        with col2:
-            education = st.selectbox(
-                f"🎓 {t('education_label')}",
-                options=[1, 2, 3, 4, 5, 6],
-                format_func=lambda x: EDUCATION_LEVELS[st.session_state.language][x],
-                index=3,
-                key="education"
-            )
+            with col2:
+                st.selectbox(
+                    f"🎓 {T.education_label}",
+                    options=[1, 2, 3, 4, 5, 6],
+                    format_func=EDUCATION_LEVELS[lang].__getitem__,
+                    index=3,
+                    key="education"
+                )
             
-            employment = st.selectbox(
-                f"💼 {t('employment_label')}",
-                options=[1, 2, 3, 4, 5, 6],
-                format_func=lambda x: EMPLOYMENT_STATUS[st.session_state.language][x],
-                index=3,
-                key="employment"
-            )
-        
-        st.session_state.user_data.update({
-            'AGE_GROUP': age_group,
-            'AGE': age_group,  # Using same value for both
-            'SEX': sex,
-            'EDUCATION_LEVEL': education,
-            'EMPLOYMENT_STATUS': employment
-        })
-        
-        if st.button(f"➡️ {t('next')}: {t('step2_title')}", use_container_width=True, help="Press Alt+N or → to continue"):
-            st.session_state.current_step = 2
-            st.rerun()
+                st.selectbox(
+                    f"💼 {T.employment_label}",
+                    options=[1, 2, 3, 4, 5, 6],
+                    format_func=EMPLOYMENT_STATUS[lang].__getitem__,
+                    index=3,
+                    key="employment"
+                )
+            
+            st.form_submit_button(f"➡️ {T.next}: {T.step2_title}", use_container_width=True, help="Press Alt+N or → to continue",
+                                  on_click=go_to_step, args=(2, {
+                                      'AGE_GROUP': 'age_group',
+                                      'AGE': 'age_group',  # Using same value for both
+                                      'SEX': 'sex',
+                                      'EDUCATION_LEVEL': 'education',
+                                      'EMPLOYMENT_STATUS': 'employment'
+                                  }))
     
     # STEP 2: Physical Measurements
     elif st.session_state.current_step == 2:
-        st.markdown(f'<h2 class="section-header" role="heading" aria-level="2">{t("step")} 2️⃣: {t("step2_title")}</h2>', unsafe_allow_html=True)
+        st.markdown(f'<h2 class="section-header" role="heading" aria-level="2">{T.step} 2️⃣: {T.step2_title}</h2>', unsafe_allow_html=True)
         
         # Screen reader context
         st.markdown('<span class="sr-only">Step 2 of 5: Please provide your physical health measurements including weight, height, and general health status.</span>', unsafe_allow_html=True)
         
-        show_help_button(t('step2_help'), "step2")
+        show_help(T.step2_help)
         
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            weight_kg = st.number_input(
-                f"⚖️ {t('weight_label')}",
-                min_value=20.0,
-                max_value=300.0,
-                value=st.session_state.user_data.get('weight_kg', 75.0),
-                step=0.5,
-                key="weight_kg"
-            )
-            
-            height_cm = st.number_input(
-                f"📏 {t('height_label')}",
-                min_value=100.0,
-                max_value=250.0,
-                value=st.session_state.user_data.get('height_cm', 170.0),
-                step=0.5,
-                key="height_cm"
-            )
-            
-            # Calculate BMI from weight (kg) and height (cm)
-            height_m = height_cm / 100.0  # Convert cm to meters
-            bmi = weight_kg / (height_m ** 2)
-            
-            # Display calculated BMI
-            st.markdown(f"""
-            <div class="info-box" style="padding: 15px; margin: 10px 0;">
-                <strong>📊 {t('bmi_calculated')}:</strong> <span style="font-size: 24px; font-weight: bold;">{bmi:.1f}</span>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Calculate BMI category
-            if bmi < 18.5:
-                bmi_category = 1  # Underweight
-            elif bmi < 25:
-                bmi_category = 2  # Normal
-            elif bmi < 30:
-                bmi_category = 3  # Overweight
-            else:
-                bmi_category = 4  # Obese
-            
-            # Convert weight from kg to pounds for the model (1 kg = 2.20462 lbs)
-            weight_lbs = weight_kg * 2.20462
-        
-        with col2:
-            gen_health = st.selectbox(
-                f"❤️ {t('gen_health_label')}",
-                options=[1, 2, 3, 4, 5],
-                format_func=lambda x: HEALTH_RATING[st.session_state.language][x],
-                index=st.session_state.user_data.get('GEN_HLTH', 3) - 1,
-                key="gen_health"
-            )
-            
-            checkup = st.selectbox(
-                f"🩺 {t('checkup_label')}",
-                options=[1, 2, 3, 4, 5],
-                format_func=lambda x: CHECKUP_STATUS[st.session_state.language][x],
-                index=0,
-                key="checkup"
-            )
-        
-        st.session_state.user_data.update({
-            'weight_kg': weight_kg,
-            'height_cm': height_cm,
-            'WGHT (lbs)': weight_lbs,
-            'BMI': bmi,
-            'BMI_CATEGORY': bmi_category,
-            'GEN_HLTH': gen_health,
-            'CHKP_STATUS': checkup
-        })
+        # Rerunning just the fragment keeps the live BMI readout off the full script
+        step2_measurements()
         
         col_back, col_next = st.columns(2)
         with col_back:
-            if st.button(f"⬅️ {t('back')}", use_container_width=True, help="Press Alt+B or ← to go back"):
-                st.session_state.current_step = 1
-                st.rerun()
+            st.button(f"⬅️ {T.back}", use_container_width=True, help="Press Alt+B or ← to go back",
+                      on_click=leave_step2, args=(1,))
         with col_next:
-            if st.button(f"➡️ {t('next')}: {t('step3_title')}", use_container_width=True, help="Press Alt+N or → to continue"):
-                st.session_state.current_step = 3
-                st.rerun()
+            st.button(f"➡️ {T.next}: {T.step3_title}", use_container_width=True, help="Press Alt+N or → to continue",
+                      on_click=leave_step2, args=(3,))
     
     # STEP 3: Health Conditions & Medications
     elif st.session_state.current_step == 3:
-        st.markdown(f'<h2 class="section-header" role="heading" aria-level="2">{t("step")} 3️⃣: {t("step3_title")}</h2>', unsafe_allow_html=True)
+        lang = st.session_state.language
+        st.markdown(f'<h2 class="section-header" role="heading" aria-level="2">{T.step} 3️⃣: {T.step3_title}</h2>', unsafe_allow_html=True)
         
         # Screen reader context
         st.markdown('<span class="sr-only">Step 3 of 5: Please provide information about your current health conditions and medications.</span>', unsafe_allow_html=True)
         
-        show_help_button(t('step3_help'), "step3")
-        
-        bp_meds = st.radio(
-            f"💊 {t('bp_meds_label')}",
-            options=[0, 1],
-            format_func=lambda x: f"✅ {t('yes_bp')}" if x == 1 else f"❌ {t('no_bp')}",
-            index=st.session_state.user_data.get('BP_MEDS', 0),
-            key="bp_meds"
-        )
-        
-        chol_meds = st.radio(
-            f"💊 {t('chol_meds_label')}",
-            options=[0, 1],
-            format_func=lambda x: f"✅ {t('yes_chol')}" if x == 1 else f"❌ {t('no_chol')}",
-            index=st.session_state.user_data.get('CHOL_MEDS', 0),
-            key="chol_meds"
-        )
+        show_help(T.step3_help)
         
-        doctor_visits = st.selectbox(
-            f"👨‍⚕️ {t('doctor_visits_label')}",
-            options=[1, 2, 3, 4],
-            format_func=lambda x: DOCTOR_VISITS[st.session_state.language][x],
-            index=st.session_state.user_data.get('DCTR_STATUS', 2) - 1,
-            key="doctor_visits"
-        )
+        with st.form("step3_form", border=False):
+            st.radio(
+                f"💊 {T.bp_meds_label}",
+                options=[0, 1],
+                format_func=lambda x: f"✅ {T.yes_bp}" if x == 1 else f"❌ {T.no_bp}",
+                index=st.session_state.user_data.get('BP_MEDS', 0),
+                key="bp_meds"
+            )
         
-        st.session_state.user_data.update({
-            'BP_MEDS': bp_meds,
-            'CHOL_MEDS': chol_meds,
-            'DCTR_STATUS': doctor_visits
-        })
+            st.radio(
+                f"💊 {T.chol_meds_label}",
+                options=[0, 1],
+                format_func=lambda x: f"✅ {T.yes_chol}" if x == 1 else f"❌ {T.no_chol}",
+                index=st.session_state.user_data.get('CHOL_MEDS', 0),
+                key="chol_meds"
+            )
         
-        col_back, col_next = st.columns(2)
-        with col_back:
-            if st.button(f"⬅️ {t('back')}", use_container_width=True, help="Press Alt+B or ← to go back"):
-                st.session_state.current_step = 2
-                st.rerun()
-        with col_next:
-            if st.button(f"➡️ {t('next')}: {t('step4_title')}", use_container_width=True, help="Press Alt+N or → to continue"):
-                st.session_state.current_step = 4
-                st.rerun()
+            st.selectbox(
+                f"👨‍⚕️ {T.doctor_visits_label}",
+                options=[1, 2, 3, 4],
+                format_func=DOCTOR_VISITS[lang].__getitem__,
+                index=st.session_state.user_data.get('DCTR_STATUS', 2) - 1,
+                key="doctor_visits"
+            )
+            
+            step3_fields = {'BP_MEDS': 'bp_meds', 'CHOL_MEDS': 'chol_meds', 'DCTR_STATUS': 'doctor_visits'}
+            col_back, col_next = st.columns(2)
+            with col_back:
+                st.form_submit_button(f"⬅️ {T.back}", use_container_width=True, help="Press Alt+B or ← to go back",
+                                      on_click=go_to_step, args=(2, step3_fields))
+            with col_next:
+                st.form_submit_button(f"➡️ {T.next}: {T.step4_title}", use_container_width=True, help="Press Alt+N or → to continue",
+                                      on_click=go_to_step, args=(4, step3_fields))
     
     # STEP 4: Lifestyle Habits
     elif st.session_state.current_step == 4:
-        st.markdown(f'<h2 class="section-header" role="heading" aria-level="2">{t("step")} 4️⃣: {t("step4_title")}</h2>', unsafe_allow_html=True)
+        lang = st.session_state.language
+        st.markdown(f'<h2 class="section-header" role="heading" aria-level="2">{T.step} 4️⃣: {T.step4_title}</h2>', unsafe_allow_html=True)
         
         # Screen reader context
         st.markdown('<span class="sr-only">Step 4 of 5: Please provide information about your lifestyle habits including exercise and alcohol consumption.</span>', unsafe_allow_html=True)
         
-        show_help_button(t('step4_help'), "step4")
-        
-        exercise = st.radio(
-            f"🏋️ {t('exercise_label')}",
-            options=[0, 1],
-            format_func=lambda x: f"✅ {t('yes_exercise')}" if x == 1 else f"❌ {t('no_exercise')}",
-            index=st.session_state.user_data.get('EXER_STATUS', 1),
-            key="exercise"
-        )
+        show_help(T.step4_help)
         
-        alcohol = st.radio(
-            f"🍺 {t('alcohol_label')}",
-            options=[1, 2, 3, 4],
-            format_func=lambda x: ALCOHOL_STATUS[st.session_state.language][x],
-            index=st.session_state.user_data.get('ALHL_STATUS', 1) - 1,
-            key="alcohol"
-        )
-        
-        st.session_state.user_data.update({
-            'EXER_STATUS': exercise,
-            'ALHL_STATUS': alcohol
-        })
+        with st.form("step4_form", border=False):
+            st.radio(
+                f"🏋️ {T.exercise_label}",
+                options=[0, 1],
+                format_func=lambda x: f"✅ {T.yes_exercise}" if x == 1 else f"❌ {T.no_exercise}",
+                index=st.session_state.user_data.get('EXER_STATUS', 1),
+                key="exercise"
+            )
         
-        col_back, col_next = st.columns(2)
-        with col_back:
-            if st.button(f"⬅️ {t('back')}", use_container_width=True, help="Press Alt+B or ← to go back"):
-                st.session_state.current_step = 3
-                st.rerun()
-        with col_next:
-            if st.button(f"➡️ {t('calculate')}", use_container_width=True, help="Press Enter to calculate your results"):
-                st.session_state.current_step = 5
-                st.rerun()
+            st.radio(
+                f"🍺 {T.alcohol_label}",
+                options=[1, 2, 3, 4],
+                format_func=ALCOHOL_STATUS[lang].__getitem__,
+                index=st.session_state.user_data.get('ALHL_STATUS', 1) - 1,
+                key="alcohol"
+            )
+            
+            step4_fields = {'EXER_STATUS': 'exercise', 'ALHL_STATUS': 'alcohol'}
+            col_back, col_next = st.columns(2)
+            with col_back:
+                st.form_submit_button(f"⬅️ {T.back}", use_container_width=True, help="Press Alt+B or ← to go back",
+                                      on_click=go_to_step, args=(3, step4_fields))
+            with col_next:
+                st.form_submit_button(f"➡️ {T.calculate}", use_container_width=True, help="Press Enter to calculate your results",
+                                      on_click=go_to_step, args=(5, step4_fields))
     
     # STEP 5: Results
     elif st.session_state.current_step == 5:
-        st.markdown(f'<h2 class="section-header" role="heading" aria-level="2">📊 {t("results_title")}</h2>', unsafe_allow_html=True)
+        st.markdown(f'<h2 class="section-header" role="heading" aria-level="2">📊 {T.results_title}</h2>', unsafe_allow_html=True)
         
         # Screen reader context
         st.markdown('<span class="sr-only">Step 5 of 5: Your personalized diabetes risk assessment results and recommendations.</span>', unsafe_allow_html=True)
@@ -1318,32 +1226,24 @@ def main():
         # Prepare input data
         input_data = st.session_state.user_data.copy()
         
-        # Create DataFrame with all required features
-        input_df = pd.DataFrame([input_data])
-        
-        # Add any missing features with default values
-        for feature in features:
-            if feature not in input_df.columns:
-                input_df[feature] = 0
-        
-        # Reorder columns to match training
-        input_df = input_df[features]
+        # Column of each answered feature in training order; missing features default to 0
+        feature_index = get_feature_index(features)
+        answered = [(feature_index[name], value) for name, value in input_data.items() if name in feature_index]
+        indices = np.array([j for j, _ in answered], dtype=np.int64)
+        values = np.array([value for _, value in answered], dtype=np.float32)
         
         try:
-            # Scale the input
-            input_scaled = scaler.transform(input_df)
+            # Assemble and scale the input row
+            input_scaled = _fill_and_scale(indices, values, *scaler)
             
             # Make prediction with loading animation
-            with st.spinner(f'🔬 {t("analyzing")}'):
-                time.sleep(1)  # Brief pause for better UX
-                prediction = model.predict(input_scaled)[0]
-                probability = model.predict_proba(input_scaled)[0][1]
+            with st.spinner(f'🔬 {T.analyzing}'):
+                probability = predict_probability(tuple(input_scaled[0]))
             
             # Get probability level - translate the level
-            level_key = 'LOW' if probability < 0.3 else ('MODERATE' if probability < 0.6 else 'HIGH')
+            band = get_probability_band(probability)
+            level_key, prob_class, prob_emoji = PROBABILITY_LEVELS[band]
             prob_level = t(level_key)
-            prob_class = "prob-low" if probability < 0.3 else ("prob-medium" if probability < 0.6 else "prob-high")
-            prob_emoji = "🟢" if probability < 0.3 else ("🟡" if probability < 0.6 else "🔴")
             
             # ================================================================
             # DISPLAY RESULTS
@@ -1352,76 +1252,36 @@ def main():
             # Main result box
             st.markdown(f"""
             <div class="{prob_class}" role="region" aria-label="Diabetes risk assessment result">
-                <div class="prob-text">{prob_emoji} {t('diabetes_likelihood')}: {prob_level}</div>
+                <div class="prob-text">{prob_emoji} {T.diabetes_likelihood}: {prob_level}</div>
                 <div class="probability-text">
-                    {t('probability_score')}: {probability*100:.1f}%
+                    {T.probability_score}: {probability*100:.1f}%
                 </div>
                 <p style="font-size: {st.session_state.font_size * 0.9}px; margin-top: 15px;">
-                    {t('current_profile')} <strong>{t(level_key.lower())}</strong> {t('likelihood_of')}
+                    {T.current_profile} <strong>{t(level_key.lower())}</strong> {T.likelihood_of}
                 </p>
                 <span class="sr-only">Your diabetes risk level is {prob_level} with a probability score of {probability*100:.1f} percent.</span>
             </div>
             """, unsafe_allow_html=True)
             
             # Interpretation with larger, clearer text
-            if probability < 0.3:
-                st.success(f"""
-                ### ✅ {t('low_title')}
-                
-                {t('low_msg')}
-                
-                **{t('low_keep')}**
-                - ✓ {t('low_1')}
-                - ✓ {t('low_2')}
-                - ✓ {t('low_3')}
-                - ✓ {t('low_4')}
-                
-                **{'Remember' if st.session_state.language == 'en' else 'Ingat'}:** {t('low_remember')}
-                """)
-            elif probability < 0.6:
-                st.warning(f"""
-                ### ⚠️ {t('moderate_title')}
-                
-                {t('moderate_msg')}
-                
-                **{t('moderate_what')}**
-                - 📞 {t('moderate_1')}
-                - 🥗 {t('moderate_2')}
-                - 🏃 {t('moderate_3')}
-                - 📊 {t('moderate_4')}
-                - ⚖️ {t('moderate_5')}
-                
-                **{'Good news' if st.session_state.language == 'en' else 'Berita baik'}:** {t('moderate_good')}
-                """)
-            else:
-                st.error(f"""
-                ### 🚨 {t('high_title')}
-                
-                {t('high_msg')}
-                
-                **{t('high_steps')}**
-                - 🏥 {t('high_1')}
-                - 🩸 {t('high_2')}
-                - 💬 {t('high_3')}
-                - 🥗 {t('high_4')}
-                - 🏃 {t('high_5')}
-                - ⚖️ {t('high_6')}
-                
-                **{'Remember' if st.session_state.language == 'en' else 'Ingat'}:** {t('high_remember')}
-                """)
+            alert, title_icon, title_key, msg_key, list_key, items, closing_label, closing_key = \
+                INTERPRETATION_BANDS[band]
+            lines = [f"### {title_icon} {t(title_key)}", "", t(msg_key), "", f"**{t(list_key)}**"]
+            lines += [f"- {icon} {t(key)}" for icon, key in items]
+            lines += ["", f"**{closing_label[st.session_state.language]}:** {t(closing_key)}"]
+            getattr(st, alert)("\n".join(lines))
             
             st.markdown("---")
             
             # ================================================================
             # SHAP EXPLANATIONS
             # ================================================================
-            st.markdown(f'<h2 class="section-header">💡 {t("understanding_title")}</h2>', unsafe_allow_html=True)
-            
             st.markdown(f"""
+            <h2 class="section-header">💡 {T.understanding_title}</h2>
             <div class="info-box">
-                <strong style="font-size: 22px;">{t('what_influences')}</strong><br><br>
+                <strong style="font-size: 22px;">{T.what_influences}</strong><br><br>
                 <span style="font-size: 19px;">
-                {t('influences_msg')}
+                {T.influences_msg}
                 </span>
             </div>
             """, unsafe_allow_html=True)
@@ -1429,47 +1289,33 @@ def main():
             try:
                 # Calculate SHAP values
                 with st.spinner('🔍 Analyzing your risk factors...'):
-                    explainer = shap.TreeExplainer(model)
-                    shap_values = explainer.shap_values(input_scaled)
-                    
-                    # Handle multi-output SHAP values
-                    if isinstance(shap_values, list):
-                        shap_values = shap_values[1]
-                    
-                    # Generate explanations
-                    explanations = generate_explanation(
-                        shap_values[0], 
-                        features, 
-                        input_scaled[0]
-                    )
+                    shap_values = compute_shap_values(tuple(input_scaled[0]))
                 
-                st.markdown(f"### 🔍 {t('top5_factors')}")
-                
-                for i, exp in enumerate(explanations, 1):
-                    # Get language-specific feature name and description
-                    feature_name = exp['feature_ms'] if st.session_state.language == 'ms' else exp['feature_en']
-                    feature_desc = exp['description_ms'] if st.session_state.language == 'ms' else exp['description_en']
-                    
-                    if exp['is_positive']:
-                        icon = f"⬆️ {t('increases_prob')}"
-                        color = "#C53030"
-                        card_class = "factor-card-positive"
-                    else:
-                        icon = f"⬇️ {t('decreases_prob')}"
-                        color = "#276749"
-                        card_class = "factor-card-negative"
+                if shap_values is None:
+                    st.info(f"💭 {T.no_factor_breakdown}")
+                else:
+                    # Generate explanations
+                    explanations = generate_explanation(shap_values[0], features)
                     
-                    impact_text = f"{t('impact')} {t(exp['impact'])} {t(exp['direction'])} {t('your_prob')}"
+                    st.markdown(f"### 🔍 {T.top5_factors}")
                     
-                    st.markdown(f"""
-                    <div class="{card_class}">
-                        <strong style="font-size: 26px;">{i}. {feature_name}</strong><br><br>
-                        <span style="font-size: 20px; line-height: 1.7;">
-                        {feature_desc} <span style="color: {color}; font-weight: bold; font-size: 22px;">{icon}</span><br><br>
-                        <em>{impact_text}</em>
-                        </span>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    # All five cards go out in one markdown element; the template has
+                    # no blank lines, so the HTML block isn't split
+                    lang = st.session_state.language
+                    cards = []
+                    for i, exp in enumerate(explanations, 1):
+                        arrow, label_key, color, card_class = FACTOR_DIRECTION_STYLES[exp['is_positive']]
+                        cards.append(FACTOR_CARD_TEMPLATE.format_map({
+                            'card_class': card_class,
+                            'i': i,
+                            # Language-specific feature name and description
+                            'feature_name': exp[f'feature_{lang}'],
+                            'feature_desc': exp[f'description_{lang}'],
+                            'color': color,
+                            'icon': f"{arrow} {t(label_key)}",
+                            'impact_text': f"{T.impact} {t(exp['impact'])} {t(exp['direction'])} {T.your_prob}",
+                        }))
+                    st.markdown("\n".join(cards), unsafe_allow_html=True)
                 
             except Exception as e:
                 st.info("💭 Detailed factor analysis is being processed...")
@@ -1479,85 +1325,39 @@ def main():
             # ================================================================
             # PERSONALIZED RECOMMENDATIONS
             # ================================================================
-            st.markdown(f'<h2 class="section-header">📝 {t("action_plan_title")}</h2>', unsafe_allow_html=True)
-            
-            recommendations = []
-            
-            # Generate personalized recommendations
-            if input_data.get('BMI', 0) >= 25:
-                recommendations.append({
-                    'icon': '⚖️',
-                    'title': t('rec_weight_title'),
-                    'text': t('rec_weight_text'),
-                    'action': t('rec_weight_action')
-                })
-            
-            if input_data.get('EXER_STATUS', 1) == 0:
-                recommendations.append({
-                    'icon': '🏃',
-                    'title': t('rec_exercise_title'),
-                    'text': t('rec_exercise_text'),
-                    'action': t('rec_exercise_action')
-                })
-            
-            if input_data.get('GEN_HLTH', 3) >= 4:
-                recommendations.append({
-                    'icon': '❤️',
-                    'title': t('rec_health_title'),
-                    'text': t('rec_health_text'),
-                    'action': t('rec_health_action')
-                })
-            
-            if input_data.get('BP_MEDS', 0) == 1 or input_data.get('CHOL_MEDS', 0) == 1:
-                recommendations.append({
-                    'icon': '💊',
-                    'title': t('rec_meds_title'),
-                    'text': t('rec_meds_text'),
-                    'action': t('rec_meds_action')
-                })
-            
-            if input_data.get('ALHL_STATUS', 1) >= 3:
-                recommendations.append({
-                    'icon': '🍺',
-                    'title': t('rec_alcohol_title'),
-                    'text': t('rec_alcohol_text'),
-                    'action': t('rec_alcohol_action')
-                })
-            
-            if not recommendations:
-                recommendations.append({
-                    'icon': '✅',
-                    'title': t('rec_good_title'),
-                    'text': t('rec_good_text'),
-                    'action': t('rec_good_action')
-                })
+            # Read the answers the rules need once, then derive the cache-key flags
+            get = input_data.get
+            bmi, exercise, gen_health = get('BMI', 0), get('EXER_STATUS', 1), get('GEN_HLTH', 3)
+            bp_meds, chol_meds, alcohol = get('BP_MEDS', 0), get('CHOL_MEDS', 0), get('ALHL_STATUS', 1)
+            recommendations = build_recommendations(
+                st.session_state.language,
+                bmi >= 25,
+                exercise == 0,
+                gen_health >= 4,
+                bp_meds == 1 or chol_meds == 1,
+                alcohol >= 3,
+            )
             
+            # Section header and every card in one markdown element
+            html_parts = [f'<h2 class="section-header">📝 {T.action_plan_title}</h2>']
             for rec in recommendations:
-                st.markdown(f"""
-                <div class="action-card">
-                    <strong style="font-size: 24px;">{rec['icon']} {rec['title']}</strong><br><br>
-                    <span style="font-size: 19px; line-height: 1.7;">
-                    {rec['text']}<br><br>
-                    <span class="action-highlight"><strong>👉 {t('action_step')}</strong></span> {rec['action']}
-                    </span>
-                </div>
-                """, unsafe_allow_html=True)
+                html_parts.append(ACTION_CARD_TEMPLATE.format_map({**rec, 'action_step': T.action_step}))
+            st.markdown("\n".join(html_parts), unsafe_allow_html=True)
             
             # ================================================================
             # NEXT STEPS
             # ================================================================
             st.markdown("---")
-            st.markdown(f'<h2 class="section-header">🎯 {t("next_steps_title")}</h2>', unsafe_allow_html=True)
-            
             st.markdown(f"""
+            <h2 class="section-header">🎯 {T.next_steps_title}</h2>
             <div class="info-box">
-                <strong style="font-size: 24px;">📋 {t('recommended_steps')}</strong><br><br>
+                <strong style="font-size: 24px;">📋 {T.recommended_steps}</strong><br><br>
                 <span style="font-size: 20px; line-height: 2;">
-                1️⃣ <strong>{t('next_1')}</strong><br>
-                2️⃣ <strong>{t('next_2')}</strong><br>
-                3️⃣ <strong>{t('next_3')}</strong><br>
-                4️⃣ <strong>{t('next_4')}</strong><br>
-                5️⃣ <strong>{t('next_5')}</strong>
+                1️⃣ <strong>{T.next_1}</strong><br>
+                2️⃣ <strong>{T.next_2}</strong><br>
+                3️⃣ <strong>{T.next_3}</strong><br>
+                4️⃣ <strong>{T.next_4}</strong><br>
+                5️⃣ <strong>{T.next_5}</strong>
                 </span>
             </div>
             """, unsafe_allow_html=True)
@@ -1575,20 +1375,19 @@ def main():
             if st.session_state.get('show_confirmation', False):
                 confirm_action(
                     'restart',
-                    t('confirm_restart_title'),
-                    t('confirm_restart_msg'),
-                    lambda: restart_assessment()
+                    T.confirm_restart_title,
+                    T.confirm_restart_msg,
+                    restart_assessment
                 )
             else:
-                if st.button(f"🔄 {t('start_over')}", use_container_width=True, help="Press Alt+R to restart"):
-                    st.session_state.show_confirmation = True
-                    st.rerun()
+                st.button(f"🔄 {T.start_over}", use_container_width=True, help="Press Alt+R to restart",
+                          on_click=set_state, kwargs={'show_confirmation': True})
         
         with col_print:
             st.markdown(f"""
             <div style="text-align: center; padding: 20px;" role="note">
                 <p style="font-size: {st.session_state.font_size * 0.9}px;">
-                💡 <strong>{t('print_tip')}</strong> {t('print_msg')}
+                💡 <strong>{T.print_tip}</strong> {T.print_msg}
                 </p>
             </div>
             """, unsafe_allow_html=True)
@@ -1597,11 +1396,10 @@ def main():
     show_footer_and_disclaimer()
 
 def restart_assessment():
-    """Reset all session state to restart assessment."""
+    """Callback: reset all session state to restart assessment."""
     st.session_state.current_step = 1
     st.session_state.user_data = {}
     st.session_state.show_confirmation = False
-    st.rerun()
 
 def show_footer_and_disclaimer():
     """Display the medical disclaimer and footer."""
@@ -1611,32 +1409,9 @@ def show_footer_and_disclaimer():
     st.markdown("---")
     
     # Medical Disclaimer Box
-    font_size = st.session_state.get('font_size', 20)
-    st.markdown(f"""
-    <div style="background-color: color-mix(in srgb, #ff5555 10%, transparent); border: 4px solid #C53030; border-radius: 15px; padding: 30px; margin-top: 40px;" role="alert" aria-label="Medical disclaimer">
-        <p style="color: #C53030; font-size: {font_size * 1.2}px; font-weight: bold; margin: 0 0 20px 0;">⚠️ {t('medical_disclaimer_title')}</p>
-        <p style="font-size: {font_size * 0.95}px; line-height: 1.8; margin: 0 0 15px 0;">
-        {t('disclaimer_msg')}
-        </p>
-        <ul style="font-size: {font_size * 0.95}px; line-height: 1.8; margin: 0 0 15px 20px;">
-            <li>{t('disclaimer_1')}</li>
-            <li>{t('disclaimer_2')}</li>
-            <li>{t('disclaimer_3')}</li>
-            <li>{t('disclaimer_4')}</li>
-        </ul>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(build_disclaimer_html(st.session_state.language, st.session_state.get('font_size', 20)), unsafe_allow_html=True)
     
-    st.markdown("""
-    <div class="footer">
-        <strong style="font-size: 18px;">Diabetes Probability Assessment Tool for Older Adults</strong><br>
-        Developed for Research Project CSP760 (RO3)<br>
-        Using CDC BRFSS 2023-2024 Data with Explainable AI (SHAP/LIME)<br>
-        <br>
-        <em>For Educational and Research Purposes Only</em><br>
-        © 2026 - Not for Clinical Use
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(FOOTER_HTML, unsafe_allow_html=True)
 
 if __name__ == "__main__":
     main()